@@ -23,20 +23,84 @@ Data source: ~/.claude/projects/*/conversation_uuid.jsonl files
 
 import json
 import os
-import glob
+import mmap
+import pickle
+import tempfile
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict, namedtuple
+from collections import namedtuple
+from itertools import islice
+from operator import attrgetter, le
 from typing import Dict, List, Tuple, Optional
-import argparse
-import csv
-import urllib.parse
 from zoneinfo import ZoneInfo
 import sys
 
-# Usage data structure
+# Optional: orjson parses the JSONL logs and serializes --json output several
+# times faster than the stdlib
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# Optional: ciso8601 parses ISO 8601 timestamps (including a trailing 'Z') in C
+try:
+    from ciso8601 import parse_datetime as _parse_timestamp
+except ImportError:
+    if sys.version_info >= (3, 11):
+        # fromisoformat accepts a trailing 'Z' directly from Python 3.11 on
+        _parse_timestamp = datetime.fromisoformat
+    else:
+        def _parse_timestamp(timestamp: str) -> datetime:
+            return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+
+# Bump when the layout of cached parse results changes
+CACHE_VERSION = 3
+
+# Usage data structure. A namedtuple has no per-instance __dict__, which keeps
+# each of the (potentially millions of) records small
 Usage = namedtuple('Usage', ['input_tokens', 'output_tokens', 'cache_creation_tokens', 'cache_read_tokens', 'cost_usd', 'model', 'timestamp', 'project_name', 'session_id'])
 
+_MIN_TIMESTAMP = datetime.min.replace(tzinfo=timezone.utc)
+
+# Line templates for the daily breakdowns in print_report(), applied once per day
+DAILY_DETAIL_FMT = ("  {date}: {total_tokens:,} tokens, ${cost_usd:.2f}, {requests} requests\n"
+                    "    Input: {input_tokens:,} | Output: {output_tokens:,} | "
+                    "Cache Creation: {cache_creation_tokens:,} | Cache Read: {cache_read_tokens:,}").format_map
+DAILY_RECENT_FMT = "  {date}: {total_tokens:,} tokens, ${cost_usd:.4f}, {requests} requests".format_map
+
+
+def _timestamp_sort_key(usage: Usage) -> datetime:
+    """Sort key ordering records chronologically, with undated records first."""
+    return usage.timestamp or _MIN_TIMESTAMP
+
+
+def _is_time_ordered(usage_data: List[Usage]) -> bool:
+    """Check, without copying, that records are already in _timestamp_sort_key order."""
+    keys = map(_timestamp_sort_key, usage_data)
+    next_keys = map(_timestamp_sort_key, islice(usage_data, 1, None))
+    return all(map(le, keys, next_keys))
+
+
+def _stats_dict(stats: list) -> dict:
+    """Turn an analyze_usage() accumulator list into its stats dict."""
+    return {
+        'input_tokens': stats[0], 'output_tokens': stats[1],
+        'cache_creation_tokens': stats[2], 'cache_read_tokens': stats[3],
+        'cost_usd': stats[4], 'requests': stats[5]
+    }
+
+
+def _daily_stats_dict(stats: list) -> dict:
+    """Like _stats_dict(), plus the per-day totals reports and exports print."""
+    day_stats = _stats_dict(stats)
+    day_stats['total_tokens'] = stats[0] + stats[1] + stats[2]
+    day_stats['avg_cost_per_request'] = stats[4] / stats[5] if stats[5] else 0
+    return day_stats
+
+
 class ClaudeUsageTracker:
+    # Daily breakdowns are reported in Pacific time
+    _LA_TZ = ZoneInfo('America/Los_Angeles')
+    
     def __init__(self, claude_dir: str = None):
         # CUSTOMIZATION: If Claude Code stores data elsewhere, modify the default path below
         # Default: ~/.claude (standard Claude Code installation)
@@ -44,6 +108,9 @@ class ClaudeUsageTracker:
         self.claude_dir = claude_dir or os.path.expanduser("~/.claude")
         self.projects_dir = os.path.join(self.claude_dir, "projects")
         
+        # Parsed records are cached per file so unchanged logs are not re-read
+        self.cache_path = os.path.join(self.claude_dir, ".usage_cache.pkl")
+        
         # Current Claude API pricing (per million tokens) as of 2025
         # CUSTOMIZATION: Update these prices if they change in the future
         # Note: The actual costs are taken from Claude Code logs which reflect 
@@ -87,6 +154,16 @@ class ClaudeUsageTracker:
             # CUSTOMIZATION: Add new models here as they become available
             # Format: 'model-id': {'input': price, 'output': price, 'cache_creation': price, 'cache_read': price, 'name': 'Display Name'}
         }
+        
+        # Per-model price tuples, filled in lazily by get_model_prices()
+        self._price_cache = {}
+        
+        # Model ids found by the last collect_all_usage(), in first-seen order
+        self.models_seen = {}
+        
+        # Pacific day number (date ordinal) for each UTC hour seen, shared by all
+        # analyze_usage() calls
+        self._days_by_hour = {}
     
     def get_model_info(self, model_id: str) -> dict:
         """Get pricing and display info for a model."""
@@ -98,12 +175,41 @@ class ClaudeUsageTracker:
             'name': model_id
         })
         
+    def get_model_prices(self, model_id: str) -> Tuple[float, float, float, float]:
+        """Get (input, output, cache_creation, cache_read) prices per million tokens."""
+        prices = self._price_cache.get(model_id)
+        if prices is None:
+            model_info = self.get_model_info(model_id)
+            prices = (model_info['input'], model_info['output'],
+                      model_info['cache_creation'], model_info['cache_read'])
+            self._price_cache[model_id] = prices
+        return prices
+    
     def get_all_conversation_files(self) -> List[str]:
         """Find all JSONL conversation files in Claude projects."""
         # CUSTOMIZATION: If Claude Code uses a different file pattern, modify this
         # Current pattern: ~/.claude/projects/*/conversation_uuid.jsonl
-        pattern = os.path.join(self.projects_dir, "*", "*.jsonl")
-        return glob.glob(pattern)
+        # Walk with os.scandir rather than glob: each directory is listed once and
+        # entry types come from the directory listing without extra stat calls
+        files = []
+        try:
+            projects = os.scandir(self.projects_dir)
+        except OSError:
+            return files
+        
+        with projects:
+            for project in projects:
+                # Skip hidden entries, matching glob's "*" semantics
+                if project.name.startswith('.') or not project.is_dir():
+                    continue
+                try:
+                    with os.scandir(project.path) as entries:
+                        files.extend(entry.path for entry in entries
+                                     if entry.name.endswith('.jsonl') and
+                                     not entry.name.startswith('.') and entry.is_file())
+                except OSError:
+                    continue
+        return files
     
     def extract_project_name(self, file_path: str) -> str:
         """Extract project name from file path."""
@@ -126,80 +232,230 @@ class ClaudeUsageTracker:
         except:
             return "unknown"
     
-    def parse_conversation_file(self, file_path: str) -> List[Usage]:
+    def parse_conversation_file(self, file_path: str, start_offset: int = 0) -> List[Usage]:
         """Parse a single JSONL conversation file and extract usage data."""
+        return self._parse_conversation_range(file_path, start_offset)[0]
+    
+    def _parse_conversation_range(self, file_path: str, start_offset: int = 0,
+                                  start_line: int = 1) -> Tuple[List[Usage], int, int, int]:
+        """Parse usage data from start_offset to the end of a JSONL conversation file.
+        
+        Returns (records, complete, end_offset, end_line), where the last three
+        describe the position just past the final newline-terminated line. A last
+        line without a newline may still be being written, so its record is
+        returned but not counted in `complete`.
+        """
         usage_records = []
+        complete = 0
+        end_offset = start_offset
+        end_line = start_line
         project_name = self.extract_project_name(file_path)
         session_id = os.path.splitext(os.path.basename(file_path))[0]
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    try:
-                        data = json.loads(line.strip())
+            # Memory-map the file and iterate raw byte lines: both orjson and json
+            # accept UTF-8 bytes directly, so lines come straight from the OS page
+            # cache without an extra buffered read or text decode
+            with open(file_path, 'rb') as f:
+                # mmap cannot map an empty file
+                if os.fstat(f.fileno()).st_size <= start_offset:
+                    return usage_records, complete, end_offset, end_line
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    mm.seek(start_offset)
+                    line_num = start_line - 1
+                    partial_record = False
+                    for line_num, line in enumerate(iter(mm.readline, b''), start_line):
+                        # Most lines are user messages, tool results, etc. A substring
+                        # check is far cheaper than parsing them just to skip them
+                        if b'"assistant"' not in line or b'"usage"' not in line:
+                            continue
+                        try:
+                            data = _json.loads(line)
                         
-                        # Only process assistant messages with usage data
-                        # CUSTOMIZATION: If Claude Code log format changes, modify these field names
-                        if (data.get('type') == 'assistant' and 
-                            'message' in data and 
-                            'usage' in data['message']):
-                            
-                            usage = data['message']['usage']
-                            model = data['message'].get('model', 'unknown')
+                            # Only process assistant messages with usage data
+                            # CUSTOMIZATION: If Claude Code log format changes, modify these field names
+                            if data.get('type') != 'assistant':
+                                continue
+                            message = data.get('message')
+                            if not message or 'usage' not in message:
+                                continue
+                        
+                            # Pull out only the fields we need
+                            # CUSTOMIZATION: If Claude Code changes usage field names, update these
+                            usage = message['usage']
+                            input_tokens = usage.get('input_tokens', 0)
+                            output_tokens = usage.get('output_tokens', 0)
+                            cache_creation_tokens = usage.get('cache_creation_input_tokens', 0)
+                            cache_read_tokens = usage.get('cache_read_input_tokens', 0)
+                            model = message.get('model', 'unknown')
                             timestamp = data.get('timestamp', '')
-                            
+                        
                             # Calculate cost since it's not in the logs
-                            model_info = self.get_model_info(model)
+                            input_price, output_price, cache_creation_price, cache_read_price = self.get_model_prices(model)
                             cost = (
-                                (usage.get('input_tokens', 0) * model_info['input'] / 1_000_000) +
-                                (usage.get('output_tokens', 0) * model_info['output'] / 1_000_000) +
-                                (usage.get('cache_creation_input_tokens', 0) * model_info['cache_creation'] / 1_000_000) +
-                                (usage.get('cache_read_input_tokens', 0) * model_info['cache_read'] / 1_000_000)
-                            )
-                            
+                                input_tokens * input_price +
+                                output_tokens * output_price +
+                                cache_creation_tokens * cache_creation_price +
+                                cache_read_tokens * cache_read_price
+                            ) / 1_000_000
+                        
                             # Parse timestamp
                             dt = None
                             if timestamp:
                                 try:
-                                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                                    dt = _parse_timestamp(timestamp)
                                 except ValueError:
                                     dt = None
-                            
-                            # CUSTOMIZATION: If Claude Code changes usage field names, update these
-                            usage_record = Usage(
-                                input_tokens=usage.get('input_tokens', 0),
-                                output_tokens=usage.get('output_tokens', 0),
-                                cache_creation_tokens=usage.get('cache_creation_input_tokens', 0),
-                                cache_read_tokens=usage.get('cache_read_input_tokens', 0),
+                        
+                            usage_records.append(Usage(
+                                input_tokens=input_tokens,
+                                output_tokens=output_tokens,
+                                cache_creation_tokens=cache_creation_tokens,
+                                cache_read_tokens=cache_read_tokens,
                                 cost_usd=cost,
                                 model=model,
                                 timestamp=dt,
                                 project_name=project_name,
                                 session_id=session_id
-                            )
-                            
-                            usage_records.append(usage_record)
+                            ))
+                            partial_record = not line.endswith(b'\n')
                             
-                    except json.JSONDecodeError as e:
-                        print(f"Warning: Invalid JSON in {file_path}:{line_num}: {e}")
-                        continue
+                        except _json.JSONDecodeError as e:
+                            print(f"Warning: Invalid JSON in {file_path}:{line_num}: {e}")
+                            continue
+                    
+                    # Only the last line can lack a newline; leave it for the next run
+                    complete = len(usage_records) - partial_record
+                    end_offset = mm.rfind(b'\n', start_offset) + 1 or start_offset
+                    end_line = line_num + 1 if end_offset == len(mm) else line_num
                         
         except FileNotFoundError:
             print(f"Warning: File not found: {file_path}")
         except Exception as e:
             print(f"Error reading {file_path}: {e}")
             
-        return usage_records
+        return usage_records, complete, end_offset, end_line
     
-    def collect_all_usage(self) -> List[Usage]:
-        """Collect usage data from all conversation files."""
+    def _load_cache(self) -> Dict:
+        """Load cached parse results, or an empty cache if missing or stale."""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cache = pickle.load(f)
+        except Exception:
+            return {}
+        
+        # Costs are computed at parse time, so a pricing change invalidates the cache
+        if (not isinstance(cache, dict) or
+                cache.get('version') != CACHE_VERSION or
+                cache.get('pricing') != self.model_pricing):
+            return {}
+        return cache.get('files', {})
+    
+    def _save_cache(self, files: Dict):
+        """Write parse results to the cache file (best effort)."""
+        cache = {'version': CACHE_VERSION, 'pricing': self.model_pricing, 'files': files}
+        # The menu bar and tmux scripts run the CLI on timers, so concurrent
+        # writers are normal: each gets its own temp file in the same directory
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='.usage_cache.', suffix='.tmp', dir=self.claude_dir)
+        except OSError:
+            # A read-only Claude directory just means no caching
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    
+    def _read_fingerprint(self, file_path: str, offset: int) -> bytes:
+        """Return the bytes just before offset, used to detect rewritten files."""
+        with open(file_path, 'rb') as f:
+            f.seek(max(0, offset - 64))
+            return f.read(offset - f.tell())
+    
+    def collect_all_usage(self, use_cache: bool = True) -> List[Usage]:
+        """Collect usage data from all conversation files.
+        
+        Conversation logs are append-only, so for each file the cache remembers
+        how far it was parsed and only lines added since the last run are read.
+        """
         all_usage = []
+        models_seen = {}
         files = self.get_all_conversation_files()
+        cache = self._load_cache() if use_cache else {}
+        new_cache = {}
+        changed = False
         
         for file_path in files:
-            usage_records = self.parse_conversation_file(file_path)
-            all_usage.extend(usage_records)
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                st = None
+            
+            entry = cache.get(file_path)
+            if st and entry and (entry['mtime_ns'], entry['size']) != (st.st_mtime_ns, st.st_size):
+                # The file changed: resume from the cached offset only if it grew
+                # and the bytes before that offset are still the same
+                try:
+                    if (st.st_size < entry['offset'] or
+                            self._read_fingerprint(file_path, entry['offset']) != entry['fingerprint']):
+                        entry = None
+                except OSError:
+                    entry = None
             
+            if not st or not entry:
+                entry = {'offset': 0, 'line': 1, 'fingerprint': b'', 'records': [], 'models': []}
+            
+            # Records are cached as plain tuples so the cache does not depend
+            # on the module Usage was defined in (__main__ vs. imported)
+            usage_records = [Usage._make(r) for r in entry['records']]
+            models_seen.update(dict.fromkeys(entry['models']))
+            
+            new_records, complete, end_offset, end_line = [], 0, entry['offset'], entry['line']
+            if not st or entry['offset'] < st.st_size:
+                new_records, complete, end_offset, end_line = self._parse_conversation_range(
+                    file_path, entry['offset'], entry['line'])
+                usage_records.extend(new_records)
+                models_seen.update(dict.fromkeys(usage.model for usage in new_records))
+            
+            # With caching off the entry would only be thrown away, so skip the
+            # fingerprint read and the tuple copies of every record
+            if not use_cache:
+                all_usage.extend(usage_records)
+                continue
+            
+            if st and (entry.get('mtime_ns'), entry.get('size')) != (st.st_mtime_ns, st.st_size):
+                changed = True
+                try:
+                    entry = {
+                        'mtime_ns': st.st_mtime_ns,
+                        'size': st.st_size,
+                        'offset': end_offset,
+                        'line': end_line,
+                        'fingerprint': self._read_fingerprint(file_path, end_offset),
+                        'records': entry['records'] + [tuple(r) for r in new_records[:complete]],
+                        'models': list(dict.fromkeys(
+                            entry['models'] + [usage.model for usage in new_records[:complete]]))
+                    }
+                except OSError:
+                    st = None
+            
+            if st:
+                new_cache[file_path] = entry
+            all_usage.extend(usage_records)
+        
+        # Also rewrite the cache when logs have been deleted since the last run
+        if use_cache and (changed or len(new_cache) != len(cache)):
+            self._save_cache(new_cache)
+        
+        self.models_seen = models_seen
+        
+        # Keep records in chronological order so period analyses can slice them
+        all_usage.sort(key=_timestamp_sort_key)
         return all_usage
     
     def analyze_usage_periods(self, usage_data: List[Usage]) -> Dict:
@@ -213,16 +469,29 @@ class ClaudeUsageTracker:
             '60_days': now - timedelta(days=60)
         }
         
-        period_analyses = {}
+        # Each period is a contiguous tail of the time-ordered records (undated
+        # first), found by binary search and analyzed in place from its start
+        # index. collect_all_usage() already returns them in this order, so a
+        # sorted copy is only made for input that isn't
+        if not _is_time_ordered(usage_data):
+            usage_data = sorted(usage_data, key=_timestamp_sort_key)
         
         # Analyze all time
-        period_analyses['all_time'] = self.analyze_usage(usage_data)
+        period_analyses = {'all_time': self.analyze_usage(usage_data)}
         
         # Analyze specific periods
         for period_name, start_date in periods.items():
-            period_data = [u for u in usage_data if u.timestamp and u.timestamp >= start_date]
-            if period_data:
-                period_analyses[period_name] = self.analyze_usage(period_data, start_date)
+            lo, hi = 0, len(usage_data)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                timestamp = usage_data[mid].timestamp
+                if timestamp is None or timestamp < start_date:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            
+            if lo < len(usage_data):
+                period_analyses[period_name] = self.analyze_usage(usage_data, start_date, start_index=lo)
             else:
                 period_analyses[period_name] = None
                 
@@ -230,72 +499,100 @@ class ClaudeUsageTracker:
     
     def analyze_usage(self, usage_data: List[Usage], 
                      start_date: Optional[datetime] = None,
-                     end_date: Optional[datetime] = None) -> Dict:
-        """Analyze usage data and return statistics."""
-        
-        # Filter by date range if provided
-        filtered_data = usage_data
-        if start_date or end_date:
-            filtered_data = []
-            for usage in usage_data:
-                if usage.timestamp is None:
+                     end_date: Optional[datetime] = None,
+                     start_index: int = 0) -> Dict:
+        """Analyze usage data and return statistics.
+        
+        start_index skips that many leading records without copying the rest.
+        """
+        
+        # Totals, model breakdown and daily breakdown are accumulated in a single
+        # pass over the records, filtering by date range inline if provided
+        filter_dates = bool(start_date or end_date)
+        total_input_tokens = 0
+        total_output_tokens = 0
+        total_cache_creation_tokens = 0
+        total_cache_read_tokens = 0
+        total_cost = 0
+        total_requests = 0
+        
+        # Per-model and per-day accumulators are plain lists laid out as
+        # [input, output, cache_creation, cache_read, cost_usd, requests] and only
+        # turned into the dicts callers see once the loop is done
+        model_stats = {}
+        daily_stats = {}
+        
+        # Daily buckets are keyed by Pacific day number and only formatted as ISO
+        # dates once per day at the end. UTC offsets only change on the hour, so
+        # the timezone conversion runs once per distinct UTC hour, not per record
+        pacific_tz = self._LA_TZ
+        days_by_hour = self._days_by_hour
+        
+        # Unpacking each Usage tuple in the loop header is cheaper than seven
+        # separate attribute lookups per record
+        for (input_tokens, output_tokens, cache_creation_tokens, cache_read_tokens,
+             cost_usd, model, timestamp, _, _) in islice(usage_data, start_index, None):
+            if filter_dates:
+                if timestamp is None:
                     continue
-                if start_date and usage.timestamp < start_date:
+                if start_date and timestamp < start_date:
                     continue
-                if end_date and usage.timestamp > end_date:
+                if end_date and timestamp > end_date:
                     continue
-                filtered_data.append(usage)
-        
-        # Calculate totals
-        total_input_tokens = sum(u.input_tokens for u in filtered_data)
-        total_output_tokens = sum(u.output_tokens for u in filtered_data)
-        total_cache_creation_tokens = sum(u.cache_creation_tokens for u in filtered_data)
-        total_cache_read_tokens = sum(u.cache_read_tokens for u in filtered_data)
-        total_cost = sum(u.cost_usd for u in filtered_data)
-        
-        # Model breakdown
-        model_stats = defaultdict(lambda: {
-            'input_tokens': 0, 'output_tokens': 0, 
-            'cache_creation_tokens': 0, 'cache_read_tokens': 0,
-            'cost_usd': 0.0, 'requests': 0
-        })
-        
-        for usage in filtered_data:
-            model = usage.model
-            model_stats[model]['input_tokens'] += usage.input_tokens
-            model_stats[model]['output_tokens'] += usage.output_tokens
-            model_stats[model]['cache_creation_tokens'] += usage.cache_creation_tokens
-            model_stats[model]['cache_read_tokens'] += usage.cache_read_tokens
-            model_stats[model]['cost_usd'] += usage.cost_usd
-            model_stats[model]['requests'] += 1
-        
-        # Daily breakdown
-        daily_stats = defaultdict(lambda: {
-            'input_tokens': 0, 'output_tokens': 0,
-            'cache_creation_tokens': 0, 'cache_read_tokens': 0,
-            'cost_usd': 0.0, 'requests': 0
-        })
-        
-        for usage in filtered_data:
-            if usage.timestamp:
+            
+            # Totals
+            total_input_tokens += input_tokens
+            total_output_tokens += output_tokens
+            total_cache_creation_tokens += cache_creation_tokens
+            total_cache_read_tokens += cache_read_tokens
+            total_cost += cost_usd
+            total_requests += 1
+            
+            # Model breakdown
+            stats = model_stats.get(model)
+            if stats is None:
+                stats = model_stats[model] = [0, 0, 0, 0, 0.0, 0]
+            stats[0] += input_tokens
+            stats[1] += output_tokens
+            stats[2] += cache_creation_tokens
+            stats[3] += cache_read_tokens
+            stats[4] += cost_usd
+            stats[5] += 1
+            
+            # Daily breakdown
+            if timestamp:
                 # Convert UTC timestamp to PST for display
-                pst_timestamp = usage.timestamp.astimezone(ZoneInfo('America/Los_Angeles'))
-                date_key = pst_timestamp.date().isoformat()
-                daily_stats[date_key]['input_tokens'] += usage.input_tokens
-                daily_stats[date_key]['output_tokens'] += usage.output_tokens
-                daily_stats[date_key]['cache_creation_tokens'] += usage.cache_creation_tokens
-                daily_stats[date_key]['cache_read_tokens'] += usage.cache_read_tokens
-                daily_stats[date_key]['cost_usd'] += usage.cost_usd
-                daily_stats[date_key]['requests'] += 1
+                if timestamp.tzinfo is timezone.utc:
+                    hour = timestamp.toordinal() * 24 + timestamp.hour
+                    day = days_by_hour.get(hour)
+                    if day is None:
+                        day = days_by_hour[hour] = timestamp.astimezone(pacific_tz).toordinal()
+                else:
+                    day = timestamp.astimezone(pacific_tz).toordinal()
+                stats = daily_stats.get(day)
+                if stats is None:
+                    stats = daily_stats[day] = [0, 0, 0, 0, 0.0, 0]
+                stats[0] += input_tokens
+                stats[1] += output_tokens
+                stats[2] += cache_creation_tokens
+                stats[3] += cache_read_tokens
+                stats[4] += cost_usd
+                stats[5] += 1
+        
+        model_stats = {model: _stats_dict(stats) for model, stats in model_stats.items()}
+        # Format each day once, in chronological order. by_day keeps this order so
+        # reports and exports can walk it directly instead of sorting it again
+        daily_stats = {datetime.fromordinal(day).date().isoformat(): _daily_stats_dict(daily_stats[day])
+                       for day in sorted(daily_stats)}
         
         # Calculate averages
         total_days = len(daily_stats) if daily_stats else 1
         
-        # Last 30 days for more accurate daily average
-        recent_days = sorted(daily_stats.items(), key=lambda x: x[0], reverse=True)[:30]
-        recent_total_tokens = sum(stats['input_tokens'] + stats['output_tokens'] + 
-                                stats['cache_creation_tokens'] for _, stats in recent_days)
-        recent_total_cost = sum(stats['cost_usd'] for _, stats in recent_days)
+        # Last 30 days for more accurate daily average. daily_stats is already in
+        # chronological order, so these are simply its last 30 entries
+        recent_days = list(daily_stats.values())[-30:]
+        recent_total_tokens = sum(stats['total_tokens'] for stats in recent_days)
+        recent_total_cost = sum(stats['cost_usd'] for stats in recent_days)
         recent_days_count = len(recent_days) if recent_days else 1
         
         daily_avg_tokens = recent_total_tokens / recent_days_count
@@ -303,20 +600,11 @@ class ClaudeUsageTracker:
         monthly_est_tokens = daily_avg_tokens * 30
         monthly_est_cost = daily_avg_cost * 30
         
-        # Calculate API pay-as-you-go costs
-        api_cost_total = 0.0
-        api_cost_by_model = {}
-        
-        for model, stats in model_stats.items():
-            model_info = self.get_model_info(model)
-            api_cost = (
-                (stats['input_tokens'] * model_info['input'] / 1_000_000) +
-                (stats['output_tokens'] * model_info['output'] / 1_000_000) +
-                (stats['cache_creation_tokens'] * model_info['cache_creation'] / 1_000_000) +
-                (stats['cache_read_tokens'] * model_info['cache_read'] / 1_000_000)
-            )
-            api_cost_by_model[model] = api_cost
-            api_cost_total += api_cost
+        # Calculate API pay-as-you-go costs. Each record's cost was already computed
+        # from API pricing when the logs were parsed, so the per-model sums are
+        # reused instead of re-applying the same formula to the token totals
+        api_cost_by_model = {model: stats['cost_usd'] for model, stats in model_stats.items()}
+        api_cost_total = sum(api_cost_by_model.values(), 0.0)
         
         # Calculate daily API cost average
         daily_avg_api_cost = api_cost_total / total_days if total_days > 0 else 0
@@ -331,7 +619,7 @@ class ClaudeUsageTracker:
                 'total_tokens': total_input_tokens + total_output_tokens + total_cache_creation_tokens,
                 'total_cost_usd': total_cost,
                 'total_api_cost_usd': api_cost_total,
-                'total_requests': len(filtered_data),
+                'total_requests': total_requests,
                 'daily_avg_tokens': daily_avg_tokens,
                 'daily_avg_cost': daily_avg_cost,
                 'daily_avg_api_cost': daily_avg_api_cost,
@@ -346,7 +634,7 @@ class ClaudeUsageTracker:
                 }
             },
             'by_model': dict(model_stats),
-            'by_day': dict(daily_stats),
+            'by_day': daily_stats,
             'api_cost_by_model': api_cost_by_model
         }
     
@@ -392,7 +680,7 @@ class ClaudeUsageTracker:
         # Recent activity (last 30 days)
         activity_period = period_analyses.get('30_days') or period_analyses['all_time']
         if activity_period:
-            daily_items = sorted(activity_period['by_day'].items(), key=lambda x: x[0], reverse=True)
+            daily_items = list(reversed(activity_period['by_day'].items()))
             
             # Print cost breakdown chart only
             self.print_cost_line_chart(daily_items)
@@ -640,82 +928,96 @@ class ClaudeUsageTracker:
         print(f"│ Total      │ {total_requests:>8,} │ ${total_cost:>9.2f} │ {int(total_cost/total_requests*1000/0.003) if total_requests > 0 else 0:>13,} │")
         print("└────────────┴──────────┴────────────┴───────────────┘")
 
-    def print_report(self, analysis: Dict, show_detail: bool = False):
-        """Print a formatted usage report (legacy method for date-filtered reports)."""
+    def print_report(self, analysis: Dict, show_detail: bool = False, audit_pricing: bool = False):
+        """Print a formatted usage report (legacy method for date-filtered reports).
+        
+        With audit_pricing, each model also shows its cost recomputed from the
+        current price table and flags drift from the logged cost.
+        """
         summary = analysis['summary']
         
-        print("=" * 60)
-        print("CLAUDE CODE USAGE REPORT")
-        print("=" * 60)
+        # The report is built as a list of lines and written to stdout at once
+        lines = []
+        out = lines.append
+        
+        out("=" * 60)
+        out("CLAUDE CODE USAGE REPORT")
+        out("=" * 60)
         
         # Summary
-        print(f"\nSUMMARY:")
-        print(f"  Total Requests: {summary['total_requests']:,}")
-        print(f"  Total Input Tokens: {summary['total_input_tokens']:,}")
-        print(f"  Total Output Tokens: {summary['total_output_tokens']:,}")
-        print(f"  Total Cache Creation Tokens: {summary['total_cache_creation_tokens']:,}")
-        print(f"  Total Cache Read Tokens: {summary['total_cache_read_tokens']:,}")
-        print(f"  Total Tokens: {summary['total_tokens']:,}")
-        print(f"  Total Cost: ${summary['total_cost_usd']:.4f}")
+        out(f"\nSUMMARY:")
+        out(f"  Total Requests: {summary['total_requests']:,}")
+        out(f"  Total Input Tokens: {summary['total_input_tokens']:,}")
+        out(f"  Total Output Tokens: {summary['total_output_tokens']:,}")
+        out(f"  Total Cache Creation Tokens: {summary['total_cache_creation_tokens']:,}")
+        out(f"  Total Cache Read Tokens: {summary['total_cache_read_tokens']:,}")
+        out(f"  Total Tokens: {summary['total_tokens']:,}")
+        out(f"  Total Cost: ${summary['total_cost_usd']:.4f}")
         
         if summary['date_range']['start'] or summary['date_range']['end']:
-            print(f"  Date Range: {summary['date_range']['start']} to {summary['date_range']['end']}")
+            out(f"  Date Range: {summary['date_range']['start']} to {summary['date_range']['end']}")
         
         # Averages
-        print(f"\nAVERAGES:")
-        print(f"  Daily Average (Last {summary['recent_days_count']} days): {summary['daily_avg_tokens']:,.0f} tokens, ${summary['daily_avg_cost']:.2f}")
-        print(f"  Monthly Estimate: {summary['monthly_est_tokens']:,.0f} tokens, ${summary['monthly_est_cost']:.2f}")
+        out(f"\nAVERAGES:")
+        out(f"  Daily Average (Last {summary['recent_days_count']} days): {summary['daily_avg_tokens']:,.0f} tokens, ${summary['daily_avg_cost']:.2f}")
+        out(f"  Monthly Estimate: {summary['monthly_est_tokens']:,.0f} tokens, ${summary['monthly_est_cost']:.2f}")
         
         # Model breakdown
-        print(f"\nBY MODEL:")
+        out(f"\nBY MODEL:")
         for model, stats in analysis['by_model'].items():
-            model_info = self.get_model_info(model)
-            print(f"  {model_info['name']} ({model}):")
-            print(f"    Requests: {stats['requests']:,}")
-            print(f"    Input Tokens: {stats['input_tokens']:,} (${model_info['input']}/M)")
-            print(f"    Output Tokens: {stats['output_tokens']:,} (${model_info['output']}/M)")
-            print(f"    Cache Creation: {stats['cache_creation_tokens']:,} (${model_info['cache_creation']}/M)")
-            print(f"    Cache Read: {stats['cache_read_tokens']:,} (${model_info['cache_read']}/M)")
-            print(f"    Actual Cost: ${stats['cost_usd']:.4f} (from Claude Code logs)")
+            input_price, output_price, cache_creation_price, cache_read_price = prices = self.get_model_prices(model)
+            out(f"  {self.get_model_info(model)['name']} ({model}):")
+            out(f"    Requests: {stats['requests']:,}")
+            out(f"    Input Tokens: {stats['input_tokens']:,} (${input_price}/M)")
+            out(f"    Output Tokens: {stats['output_tokens']:,} (${output_price}/M)")
+            out(f"    Cache Creation: {stats['cache_creation_tokens']:,} (${cache_creation_price}/M)")
+            out(f"    Cache Read: {stats['cache_read_tokens']:,} (${cache_read_price}/M)")
+            out(f"    Actual Cost: ${stats['cost_usd']:.4f} (from Claude Code logs)")
+            
+            if not audit_pricing:
+                continue
             
             # Calculate what cost should be based on current pricing
-            calc_cost = (
-                (stats['input_tokens'] * model_info['input'] / 1_000_000) +
-                (stats['output_tokens'] * model_info['output'] / 1_000_000) +
-                (stats['cache_creation_tokens'] * model_info['cache_creation'] / 1_000_000) +
-                (stats['cache_read_tokens'] * model_info['cache_read'] / 1_000_000)
-            )
-            print(f"    Calculated Cost: ${calc_cost:.4f} (using current pricing)")
+            tokens = (stats['input_tokens'], stats['output_tokens'],
+                      stats['cache_creation_tokens'], stats['cache_read_tokens'])
+            calc_cost = sum(t * p for t, p in zip(tokens, prices)) / 1_000_000
+            out(f"    Calculated Cost: ${calc_cost:.4f} (using current pricing)")
             
             if abs(stats['cost_usd'] - calc_cost) > 0.01:
-                print(f"    Note: Difference of ${abs(stats['cost_usd'] - calc_cost):.4f} may indicate pricing changes")
+                out(f"    Note: Difference of ${abs(stats['cost_usd'] - calc_cost):.4f} may indicate pricing changes")
         
         # Daily usage breakdown
         if show_detail:
-            print(f"\nDETAILED DAILY BREAKDOWN (All Days):")
+            out(f"\nDETAILED DAILY BREAKDOWN (All Days):")
             # Show ALL days from first usage to current, chronologically
-            daily_items = sorted(analysis['by_day'].items(), key=lambda x: x[0])
-            
-            for date, stats in daily_items:
-                total_tokens = stats['input_tokens'] + stats['output_tokens'] + stats['cache_creation_tokens']
-                print(f"  {date}: {total_tokens:,} tokens, ${stats['cost_usd']:.2f}, {stats['requests']} requests")
-                print(f"    Input: {stats['input_tokens']:,} | Output: {stats['output_tokens']:,} | Cache Creation: {stats['cache_creation_tokens']:,} | Cache Read: {stats['cache_read_tokens']:,}")
+            daily_items = analysis['by_day'].items()
+            line_fmt = DAILY_DETAIL_FMT
         else:
             # Recent daily usage (last 10 days)
-            print(f"\nRECENT DAILY USAGE:")
-            daily_items = sorted(analysis['by_day'].items(), key=lambda x: x[0], reverse=True)[:10]
-            
-            for date, stats in daily_items:
-                total_tokens = stats['input_tokens'] + stats['output_tokens'] + stats['cache_creation_tokens']
-                print(f"  {date}: {total_tokens:,} tokens, ${stats['cost_usd']:.4f}, {stats['requests']} requests")
+            out(f"\nRECENT DAILY USAGE:")
+            daily_items = list(reversed(analysis['by_day'].items()))[:10]
+            line_fmt = DAILY_RECENT_FMT
+        
+        # Format every day with the shared template
+        lines.extend(
+            line_fmt(dict(stats, date=date)) for date, stats in daily_items
+        )
+        
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
+    # Imported here rather than at module level so the menu bar app and other
+    # importers of this module don't pay for argument parsing they never use
+    import argparse
+    
     parser = argparse.ArgumentParser(description='Track Claude Code token usage and costs')
     parser.add_argument('--start-date', type=str, help='Start date (YYYY-MM-DD) for legacy compatibility')
     parser.add_argument('--end-date', type=str, help='End date (YYYY-MM-DD) for legacy compatibility')
     parser.add_argument('--claude-dir', type=str, help='Path to .claude directory (default: ~/.claude)')
     parser.add_argument('--json', action='store_true', help='Output as JSON instead of formatted report')
+    parser.add_argument('--no-cache', action='store_true', help='Re-parse all conversation logs instead of using the parse cache')
+    parser.add_argument('--audit-pricing', action='store_true', help='With --start-date/--end-date, compare each model\'s logged cost to current pricing')
     
     # Sync-related commands
     parser.add_argument('--sync', action='store_true', help='Sync local usage data to iCloud')
@@ -749,7 +1051,7 @@ def main():
             
             # Initialize tracker to get usage data
             tracker = ClaudeUsageTracker(args.claude_dir)
-            usage_data = tracker.collect_all_usage()
+            usage_data = tracker.collect_all_usage(use_cache=not args.no_cache)
             
             if not usage_data:
                 print("No usage data to sync")
@@ -796,7 +1098,7 @@ def main():
             print("Error: claude_sync module not found")
             return 1
     else:
-        usage_data = tracker.collect_all_usage()
+        usage_data = tracker.collect_all_usage(use_cache=not args.no_cache)
     
     if not usage_data:
         print("No usage data found in Claude Code logs.")
@@ -811,14 +1113,14 @@ def main():
         
         if args.start_date:
             try:
-                start_date = datetime.fromisoformat(args.start_date).replace(tzinfo=timezone.utc)
+                start_date = _parse_date(args.start_date)
             except ValueError:
                 print(f"Error: Invalid start date format: {args.start_date}")
                 return 1
                 
         if args.end_date:
             try:
-                end_date = datetime.fromisoformat(args.end_date).replace(tzinfo=timezone.utc)
+                end_date = _parse_date(args.end_date)
             except ValueError:
                 print(f"Error: Invalid end date format: {args.end_date}")
                 return 1
@@ -827,9 +1129,9 @@ def main():
         analysis = tracker.analyze_usage(usage_data, start_date, end_date)
         
         if args.json:
-            print(json.dumps(analysis, indent=2, default=str))
+            print_json(analysis)
         else:
-            tracker.print_report(analysis, show_detail=True)
+            tracker.print_report(analysis, show_detail=True, audit_pricing=args.audit_pricing)
             
         # Use legacy analysis for CSV export
         export_analysis = analysis
@@ -838,7 +1140,7 @@ def main():
         period_analyses = tracker.analyze_usage_periods(usage_data)
         
         if args.json:
-            print(json.dumps(period_analyses, indent=2, default=str))
+            print_json(period_analyses)
         else:
             tracker.print_multi_period_report(period_analyses, usage_data)
         
@@ -849,6 +1151,33 @@ def main():
     return 0
 
 
+def _parse_date(value: str) -> datetime:
+    """Parse a --start-date/--end-date argument as a UTC datetime."""
+    # Plain YYYY-MM-DD, the documented form, is built directly from its digits;
+    # anything else (e.g. with a time of day) goes through fromisoformat
+    if len(value) == 10 and value[4] == value[7] == '-' and value.replace('-', '').isdigit():
+        return datetime(int(value[:4]), int(value[5:7]), int(value[8:]), tzinfo=timezone.utc)
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+def print_json(obj):
+    """Print obj as indented JSON, serializing with orjson when it is installed."""
+    if _json is json:
+        print(json.dumps(obj, indent=2, default=str))
+        return
+    
+    data = _json.dumps(obj, default=str, option=_json.OPT_INDENT_2)
+    stdout_buffer = getattr(sys.stdout, 'buffer', None)
+    if stdout_buffer is None:
+        print(data.decode('utf-8'))
+        return
+    # orjson produces UTF-8 bytes, which go straight to the binary stream once
+    # anything already printed as text has been flushed ahead of them
+    sys.stdout.flush()
+    stdout_buffer.write(data + b'\n')
+    stdout_buffer.flush()
+
+
 def format_sync_status(status: Dict) -> str:
     """Format sync status information for display."""
     lines = [
@@ -891,17 +1220,26 @@ def format_sync_status(status: Dict) -> str:
     return "\n".join(lines)
 
 
-def export_to_csv(usage_data: List[Usage], analysis: Dict, filename: str):
-    """Export detailed usage data to CSV."""
+def export_to_csv(usage_data: List[Usage], analysis: Dict, filename: str,
+                  tracker: Optional[ClaudeUsageTracker] = None):
+    """Export detailed usage data to CSV.
+    
+    Pass the tracker that collected usage_data to reuse its pricing lookups
+    and the model ids it already saw instead of scanning the records again.
+    """
+    import csv
     
     # Create a tracker instance to access model pricing info
-    tracker = ClaudeUsageTracker()
+    if tracker is None:
+        tracker = ClaudeUsageTracker()
     
     # CUSTOMIZATION: Modify the CSV output directory by changing the filename path
     # Default: saves to current working directory
     # Example: filename = f"/path/to/exports/{filename}"
     
-    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+    # A large write buffer keeps the many short CSV rows from turning into many
+    # small writes
+    with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
         writer = csv.writer(csvfile)
         
         # Write summary header
@@ -918,16 +1256,19 @@ def export_to_csv(usage_data: List[Usage], analysis: Dict, filename: str):
         writer.writerow(['Model_ID', 'Display_Name', 'Input_Price', 'Output_Price', 'Cache_Creation_Price', 'Cache_Read_Price'])
         
         # Get unique models from data
-        models_used = set(usage.model for usage in usage_data)
+        if tracker.models_seen:
+            models_used = tracker.models_seen
+        else:
+            models_used = set(usage.model for usage in usage_data)
         for model in sorted(models_used):
-            model_info = tracker.get_model_info(model)
+            input_price, output_price, cache_creation_price, cache_read_price = tracker.get_model_prices(model)
             writer.writerow([
                 model,
-                model_info['name'],
-                f"${model_info['input']:.2f}",
-                f"${model_info['output']:.2f}",
-                f"${model_info['cache_creation']:.2f}",
-                f"${model_info['cache_read']:.2f}"
+                tracker.get_model_info(model)['name'],
+                f"${input_price:.2f}",
+                f"${output_price:.2f}",
+                f"${cache_creation_price:.2f}",
+                f"${cache_read_price:.2f}"
             ])
         writer.writerow([])
         
@@ -937,22 +1278,21 @@ def export_to_csv(usage_data: List[Usage], analysis: Dict, filename: str):
                         'Cache_Creation_Tokens', 'Cache_Read_Tokens', 'Cost_USD', 
                         'Requests', 'Avg_Cost_Per_Request'])
         
-        daily_items = sorted(analysis['by_day'].items(), key=lambda x: x[0])
+        daily_rows = []
+        daily_items = analysis['by_day'].items()
         for date, stats in daily_items:
-            total_tokens = stats['input_tokens'] + stats['output_tokens'] + stats['cache_creation_tokens']
-            avg_cost_per_request = stats['cost_usd'] / stats['requests'] if stats['requests'] > 0 else 0
-            
-            writer.writerow([
+            daily_rows.append([
                 date,
-                total_tokens,
+                stats['total_tokens'],
                 stats['input_tokens'],
                 stats['output_tokens'], 
                 stats['cache_creation_tokens'],
                 stats['cache_read_tokens'],
                 f"{stats['cost_usd']:.4f}",
                 stats['requests'],
-                f"{avg_cost_per_request:.4f}"
+                f"{stats['avg_cost_per_request']:.4f}"
             ])
+        writer.writerows(daily_rows)
         
         writer.writerow([])
         
@@ -962,26 +1302,25 @@ def export_to_csv(usage_data: List[Usage], analysis: Dict, filename: str):
                         'Input_Tokens', 'Output_Tokens', 'Cache_Creation_Tokens', 
                         'Cache_Read_Tokens', 'Total_Tokens', 'Cost_USD'])
         
-        # Sort by timestamp
-        sorted_usage = sorted([u for u in usage_data if u.timestamp], 
-                             key=lambda x: x.timestamp)
-        
-        for usage in sorted_usage:
-            total_tokens = usage.input_tokens + usage.output_tokens + usage.cache_creation_tokens
-            
-            writer.writerow([
-                usage.timestamp.isoformat() if usage.timestamp else '',
-                usage.timestamp.date().isoformat() if usage.timestamp else '',
-                usage.project_name,
-                usage.session_id,
-                usage.model,
-                usage.input_tokens,
-                usage.output_tokens,
-                usage.cache_creation_tokens,
-                usage.cache_read_tokens,
-                total_tokens,
-                f"{usage.cost_usd:.4f}"
-            ])
+        # Sort by timestamp without building an intermediate list.
+        # collect_all_usage() already returns records in time order, which
+        # Timsort handles in a single linear pass
+        by_timestamp = attrgetter('timestamp')
+        sorted_usage = sorted(filter(by_timestamp, usage_data), key=by_timestamp)
+        
+        # Rows are produced by a generator and written in one writerows() call.
+        # Each record's cost was already priced when the logs were parsed, so only
+        # the token total is derived, and the date column is the leading
+        # YYYY-MM-DD of the timestamp's ISO string, formatted once per row
+        def detail_rows():
+            for (input_tokens, output_tokens, cache_creation_tokens, cache_read_tokens,
+                 cost_usd, model, timestamp, project_name, session_id) in sorted_usage:
+                timestamp_iso = timestamp.isoformat()
+                yield (timestamp_iso, timestamp_iso[:10], project_name, session_id, model,
+                       input_tokens, output_tokens, cache_creation_tokens, cache_read_tokens,
+                       input_tokens + output_tokens + cache_creation_tokens, f"{cost_usd:.4f}")
+        
+        writer.writerows(detail_rows())
 
 
 if __name__ == "__main__":
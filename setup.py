@@ -34,6 +34,7 @@ setup(
     ],
     extras_require={
         "menubar": ["rumps>=0.4.0"],  # For macOS menu bar widget
+        "fast": ["orjson>=3.0", "ciso8601>=2.0"],  # Faster JSONL and timestamp parsing
         "dev": [
             "pytest>=6.0",
             "black>=22.0",
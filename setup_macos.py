@@ -4,10 +4,15 @@ py2app setup script for Claude Usage Tracker
 
 from setuptools import setup
 import os
+import re
 
 # Ensure we're in the right directory
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
+# Keep the app version in step with the package version in setup.py
+with open('setup.py', encoding='utf-8') as f:
+    VERSION = re.search(r'version="([^"]+)"', f.read()).group(1)
+
 APP = ['claude_menu_bar.py']
 DATA_FILES = []
 OPTIONS = {
@@ -15,16 +20,21 @@ OPTIONS = {
     'plist': {
         'CFBundleName': 'Claude Usage Tracker',
         'CFBundleDisplayName': 'Claude Usage Tracker',
-        'CFBundleGetInfoString': "Claude Usage Tracker 0.1.0",
+        'CFBundleGetInfoString': f"Claude Usage Tracker {VERSION}",
         'CFBundleIdentifier': 'com.andybowu.claude-usage-tracker',
-        'CFBundleVersion': '0.1.0',
-        'CFBundleShortVersionString': '0.1.0',
+        'CFBundleVersion': VERSION,
+        'CFBundleShortVersionString': VERSION,
         'NSHumanReadableCopyright': 'Copyright © 2025 Andy Bo Wu',
         'LSUIElement': True,  # Run as menu bar app without dock icon
         'NSRequiresAquaSystemAppearance': False,  # Support dark mode
     },
     'packages': ['rumps'],
     'includes': ['claude_usage_tracker', 'claude_floating_window'],
+    # Build and test tooling that modulegraph can reach through setuptools and
+    # the stdlib but the app never imports at runtime. tkinter stays in: the
+    # floating window needs it
+    'excludes': ['pytest', 'test', 'unittest', 'pydoc', 'doctest', 'distutils',
+                 'setuptools', 'pip', 'black', 'flake8'],
 }
 
 setup(
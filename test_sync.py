@@ -7,30 +7,83 @@ including error handling for when iCloud is not available.
 """
 
 import json
+import operator
 import os
 import sys
 import tempfile
-import shutil
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 import platform
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 # Import the necessary modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from claude_usage_tracker import Usage, ClaudeUsageTracker
 
+# Optional: orjson serializes the test exports several times faster than the
+# stdlib and produces the same indented JSON
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+# Usage fields written to a machine's sync export, and the keys they are
+# written under. Usage is a namedtuple, so the fields are fetched by position
+# with itemgetter rather than by name through attribute descriptors
+_EXPORT_FIELDS = operator.itemgetter(*map(Usage._fields.index, (
+    'session_id', 'input_tokens', 'output_tokens', 'cache_creation_tokens',
+    'cache_read_tokens', 'cost_usd', 'model', 'timestamp', 'project_name')))
+_EXPORT_KEYS = (
+    'session_id', 'input_tokens', 'output_tokens', 'cache_creation_tokens',
+    'cache_read_tokens', 'total_cost', 'model', 'timestamp', 'project')
+
+
+def _fast_rmtree(path: str):
+    """Remove a directory tree, unlinking its files from a thread pool.
+    
+    Directories are walked with os.scandir; symlinks are removed, never
+    followed. Each unlink releases the GIL, so the pool overlaps them.
+    """
+    dirs = []
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        stack = [path]
+        unlinks = []
+        while stack:
+            current = stack.pop()
+            dirs.append(current)
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        unlinks.append(executor.submit(os.unlink, entry.path))
+        for future in unlinks:
+            future.result()
+    
+    # Children were discovered after their parents, so remove in reverse
+    for directory in reversed(dirs):
+        os.rmdir(directory)
+
 
 class SyncTester:
     """Test harness for Claude sync functionality."""
     
-    def __init__(self, use_temp_dir: bool = True):
+    def __init__(self, use_temp_dir: bool = True, verbose_tb: bool = False):
         """Initialize the sync tester."""
         self.use_temp_dir = use_temp_dir
+        self.verbose_tb = verbose_tb
         self.temp_dir = None
         self.original_home = None
+        self._sample_template = None
+        # ISO strings for the template's timestamps, keyed by timestamp
+        self._iso_timestamps = {}
         
         # Check if we're on macOS
         self.is_macos = platform.system() == 'Darwin'
@@ -60,14 +113,21 @@ class SyncTester:
     def cleanup_test_environment(self):
         """Clean up the test environment."""
         if self.temp_dir and Path(self.temp_dir).exists():
-            shutil.rmtree(self.temp_dir)
+            _fast_rmtree(self.temp_dir)
             print(f"Test environment cleaned up: {self.temp_dir}")
     
-    def create_sample_usage_data(self, machine_suffix: str = "test") -> List[Usage]:
-        """Create a sample set of usage data for testing."""
+    def _build_sample_template(self) -> List[tuple]:
+        """Build the machine-independent part of the sample records once.
+        
+        Each entry holds every Usage field except session_id, followed by the
+        record's sequence number.
+        """
+        if self._sample_template is not None:
+            return self._sample_template
+        
         base_time = datetime.now(timezone.utc) - timedelta(days=7)
         
-        usage_data = []
+        template = []
         models = [
             'claude-sonnet-4-20250514',
             'claude-opus-4-20250514',
@@ -88,21 +148,21 @@ class SyncTester:
             # Calculate cost (simplified)
             cost = (input_tokens * 0.003 + output_tokens * 0.015) / 1000
             
-            usage = Usage(
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                cache_creation_tokens=cache_creation,
-                cache_read_tokens=cache_read,
-                cost_usd=cost,
-                model=model,
-                timestamp=timestamp,
-                project_name=f"test_project_{i % 3}",
-                session_id=f"{machine_suffix}_session_{i:04d}"
-            )
-            
-            usage_data.append(usage)
+            template.append((input_tokens, output_tokens, cache_creation, cache_read,
+                             cost, model, timestamp, f"test_project_{i % 3}", i))
+        
+        self._sample_template = template
+        # Every machine's export reuses these, so format them once up front
+        self._iso_timestamps = {fields[6]: fields[6].isoformat() for fields in template}
+        return template
+    
+    def create_sample_usage_data(self, machine_suffix: str = "test") -> List[Usage]:
+        """Create a sample set of usage data for testing.
         
-        return usage_data
+        Every machine gets the same records; only the session IDs differ.
+        """
+        return [Usage(*fields[:-1], session_id=f"{machine_suffix}_session_{fields[-1]:04d}")
+                for fields in self._build_sample_template()]
     
     def test_export_to_icloud(self, usage_data: List[Usage]) -> bool:
         """Test exporting usage data to iCloud."""
@@ -171,6 +231,31 @@ class SyncTester:
             print(f"Error reading synced data: {e}")
             return None
     
+    @staticmethod
+    def _save_one(output_file: Path, blob: bytes) -> Path:
+        """Write one pre-serialized machine export.
+        
+        The data goes to a temporary file that is then renamed over the target,
+        so the reconciler never sees a half-written export.
+        """
+        tmp_file = output_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_file, output_file)
+        return output_file
+    
+    def _write_exports(self, export_blobs):
+        """Write pre-serialized machine exports concurrently.
+        
+        The files are independent and the GIL is released while writing, so
+        a thread pool overlaps them. Results are reported in machine order.
+        """
+        with ThreadPoolExecutor(max_workers=min(32, len(export_blobs) or 1)) as executor:
+            futures = [(machine_id, executor.submit(self._save_one, output_file, blob))
+                       for machine_id, output_file, blob in export_blobs]
+            for machine_id, future in futures:
+                print(f"Saved test data for {machine_id} to {future.result()}")
+    
     def test_reconciliation(self, machine_count: int = 3) -> bool:
         """Test the reconciliation process with data from multiple machines."""
         print(f"\n=== Testing Reconciliation ({machine_count} machines) ===")
@@ -189,19 +274,12 @@ class SyncTester:
                     prev_data = all_machine_data[f"test_machine_{i-1}"]
                     for j in range(3):  # Copy 3 sessions
                         duplicate = prev_data[j]
-                        # Modify slightly to create conflicts
-                        modified = Usage(
+                        # Modify slightly to create conflicts, keeping the
+                        # same session ID
+                        usage_data[j] = duplicate._replace(
                             input_tokens=duplicate.input_tokens + 10,
-                            output_tokens=duplicate.output_tokens,
-                            cache_creation_tokens=duplicate.cache_creation_tokens,
-                            cache_read_tokens=duplicate.cache_read_tokens,
-                            cost_usd=duplicate.cost_usd * 1.1,
-                            model=duplicate.model,
-                            timestamp=duplicate.timestamp,
-                            project_name=duplicate.project_name,
-                            session_id=duplicate.session_id  # Same ID = conflict
+                            cost_usd=duplicate.cost_usd * 1.1
                         )
-                        usage_data[j] = modified
                 
                 all_machine_data[machine_id] = usage_data
             
@@ -210,21 +288,25 @@ class SyncTester:
                 sync_dir = self.fake_icloud / "ClaudeUsageTracker" / "data"
                 sync_dir.mkdir(parents=True, exist_ok=True)
                 
+                # Serialize every machine's file first, then write them all in
+                # one batch
+                export_blobs = []
+                # All machines share the template's timestamps, whose ISO strings
+                # were computed with it; anything else is formatted once here
+                iso_timestamps = self._iso_timestamps
                 for machine_id, usage_data in all_machine_data.items():
                     # Convert Usage objects to dictionaries
                     data_dicts = []
-                    for usage in usage_data:
-                        data_dict = {
-                            'session_id': usage.session_id,
-                            'input_tokens': usage.input_tokens,
-                            'output_tokens': usage.output_tokens,
-                            'cache_creation_tokens': usage.cache_creation_tokens,
-                            'cache_read_tokens': usage.cache_read_tokens,
-                            'total_cost': usage.cost_usd,
-                            'model': usage.model,
-                            'timestamp': usage.timestamp.isoformat() if usage.timestamp else None,
-                            'project': usage.project_name
-                        }
+                    for fields in map(_EXPORT_FIELDS, usage_data):
+                        data_dict = dict(zip(_EXPORT_KEYS, fields))
+                        timestamp = data_dict['timestamp']
+                        if timestamp:
+                            iso = iso_timestamps.get(timestamp)
+                            if iso is None:
+                                iso = iso_timestamps[timestamp] = timestamp.isoformat()
+                            data_dict['timestamp'] = iso
+                        else:
+                            data_dict['timestamp'] = None
                         data_dicts.append(data_dict)
                     
                     # Save to file
@@ -237,10 +319,9 @@ class SyncTester:
                     }
                     
                     output_file = sync_dir / f"{machine_id}_usage.json"
-                    with open(output_file, 'w') as f:
-                        json.dump(export_data, f, indent=2)
-                    
-                    print(f"Saved test data for {machine_id} to {output_file}")
+                    export_blobs.append((machine_id, output_file, _dumps(export_data)))
+                
+                self._write_exports(export_blobs)
             
             # Run reconciliation
             print("\nRunning reconciliation process...")
@@ -260,56 +341,77 @@ class SyncTester:
             report = reconciler.reconcile()
             
             # Analyze results
-            print(f"\nReconciliation Results:")
-            print(f"  Total sessions: {report['summary']['total_sessions']}")
-            print(f"  Total conflicts: {report['conflicts']['total']}")
-            print(f"  Total errors: {report['errors']['total']}")
-            print(f"  Machines processed: {len(report['machine_stats'])}")
+            report_text = (
+                f"\nReconciliation Results:\n"
+                f"  Total sessions: {report['summary']['total_sessions']}\n"
+                f"  Total conflicts: {report['conflicts']['total']}\n"
+                f"  Total errors: {report['errors']['total']}\n"
+                f"  Machines processed: {len(report['machine_stats'])}\n"
+            )
             
             # Show conflict resolution details
             if report['conflicts']['total'] > 0:
-                print(f"\nConflict Resolution Methods:")
-                for method, count in report['conflicts']['by_resolution'].items():
-                    print(f"  {method}: {count}")
+                report_text += "\nConflict Resolution Methods:\n" + "".join(
+                    f"  {method}: {count}\n"
+                    for method, count in report['conflicts']['by_resolution'].items())
+            
+            sys.stdout.write(report_text)
+            sys.stdout.flush()
             
             return report['summary']['total_sessions'] > 0
             
         except Exception as e:
-            print(f"Error during reconciliation: {e}")
-            import traceback
-            traceback.print_exc()
+            print(f"Error during reconciliation: {type(e).__name__}: {e}")
+            if self.verbose_tb:
+                import traceback
+                traceback.print_exc()
             return False
     
-    def verify_data_integrity(self, original_data: List[Usage], synced_data: List[Usage]) -> bool:
-        """Verify that data integrity is maintained through sync/reconciliation."""
+    def verify_data_integrity(self, original_data: List[Usage], synced_data: List[Usage],
+                              strict: bool = False) -> bool:
+        """Verify that data integrity is maintained through sync/reconciliation.
+        
+        With strict, the corruption check stops at the first cost mismatch
+        instead of reporting every mismatched session.
+        """
         print("\n=== Verifying Data Integrity ===")
         
         if not synced_data:
             print("No synced data to verify")
             return False
         
-        # Create lookup dictionaries
+        # Create lookup dictionaries. Real session IDs name a conversation file
+        # and repeat across its records, so the last record per ID is compared
         original_by_id = {u.session_id: u for u in original_data}
         synced_by_id = {u.session_id: u for u in synced_data}
         
         # Check for missing sessions
-        missing_sessions = set(original_by_id.keys()) - set(synced_by_id.keys())
+        missing_sessions = original_by_id.keys() - synced_by_id.keys()
         if missing_sessions:
             print(f"❌ Missing {len(missing_sessions)} sessions after sync:")
             for session_id in list(missing_sessions)[:5]:
                 print(f"    - {session_id}")
             return False
         
-        # Check for data corruption
+        # Check for data corruption. Every original session is known to be in
+        # the synced data at this point
+        if strict:
+            if any(abs(original.cost_usd - synced_by_id[session_id].cost_usd) > 0.01
+                   for session_id, original in original_by_id.items()):
+                print("❌ Found data corruption")
+                return False
+            
+            print("✅ Data integrity verified successfully")
+            return True
+        
         corrupted = 0
         for session_id, original in original_by_id.items():
-            if session_id in synced_by_id:
-                synced = synced_by_id[session_id]
-                
-                # Allow small differences due to reconciliation
-                if abs(original.cost_usd - synced.cost_usd) > 0.01:
-                    corrupted += 1
-                    print(f"Cost mismatch for {session_id}: {original.cost_usd} vs {synced.cost_usd}")
+            synced = synced_by_id[session_id]
+            
+            # Allow small differences due to reconciliation
+            if abs(original.cost_usd - synced.cost_usd) > 0.01:
+                corrupted += 1
+                print(f"Cost mismatch for {session_id}: {original.cost_usd} vs {synced.cost_usd}")
         
         if corrupted > 0:
             print(f"❌ Found {corrupted} sessions with data corruption")
@@ -358,15 +460,18 @@ class SyncTester:
                 integrity_verified = False
             
             # Summary
-            print("\n" + "=" * 60)
-            print("TEST SUMMARY")
-            print("=" * 60)
-            print(f"Platform: {platform.system()}")
-            print(f"iCloud Available: {self.icloud_available}")
-            print(f"Export Test: {'✅ Passed' if export_success else '❌ Failed/Skipped'}")
-            print(f"Read Test: {'✅ Passed' if synced_data else '❌ Failed/Skipped'}")
-            print(f"Reconciliation Test: {'✅ Passed' if reconcile_success else '❌ Failed'}")
-            print(f"Integrity Test: {'✅ Passed' if integrity_verified else '❌ Failed/Skipped'}")
+            sys.stdout.write(
+                "\n" + "=" * 60 + "\n"
+                "TEST SUMMARY\n" +
+                "=" * 60 + "\n"
+                f"Platform: {platform.system()}\n"
+                f"iCloud Available: {self.icloud_available}\n"
+                f"Export Test: {'✅ Passed' if export_success else '❌ Failed/Skipped'}\n"
+                f"Read Test: {'✅ Passed' if synced_data else '❌ Failed/Skipped'}\n"
+                f"Reconciliation Test: {'✅ Passed' if reconcile_success else '❌ Failed'}\n"
+                f"Integrity Test: {'✅ Passed' if integrity_verified else '❌ Failed/Skipped'}\n"
+            )
+            sys.stdout.flush()
             
         finally:
             # Clean up
@@ -382,11 +487,13 @@ def main():
                        help='Use real iCloud directory instead of temp directory')
     parser.add_argument('--keep-temp', action='store_true',
                        help='Do not clean up temporary test files')
+    parser.add_argument('--verbose-tb', action='store_true',
+                       help='Print full tracebacks for reconciliation errors')
     
     args = parser.parse_args()
     
     # Create and run tester
-    tester = SyncTester(use_temp_dir=not args.no_temp)
+    tester = SyncTester(use_temp_dir=not args.no_temp, verbose_tb=args.verbose_tb)
     
     try:
         tester.run_all_tests()